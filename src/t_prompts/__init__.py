@@ -1,11 +1,8 @@
 """Structured prompts using template strings"""
 
-from .diff import (
-    RenderedPromptDiff,
-    StructuredPromptDiff,
-    diff_rendered_prompts,
-    diff_structured_prompts,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .element import (
     Element,
     ImageInterpolation,
@@ -33,17 +30,67 @@ from .parsing import (
 from .source_location import SourceLocation
 from .structured_prompt import StructuredPrompt, dedent, prompt
 from .text import process_dedent
-from .widgets import (
-    Widget,
-    WidgetConfig,
-    get_default_widget_config,
-    js_prelude,
-    set_default_widget_config,
-    setup_notebook,
-)
+
+if TYPE_CHECKING:
+    from .diff import (
+        RenderedPromptDiff,
+        StructuredPromptDiff,
+        diff_rendered_prompts,
+        diff_structured_prompts,
+    )
+    from .widgets import (
+        Widget,
+        WidgetConfig,
+        get_default_widget_config,
+        js_prelude,
+        set_default_widget_config,
+        setup_notebook,
+    )
+
+# Names resolved on first attribute access (PEP 562) so that ``from t_prompts import prompt``
+# does not pay for the diff machinery or the widget/preview stack. Everything used on the
+# render path is bound eagerly above so star-imports and attribute lookups hit the module
+# dict directly without falling back to ``__getattr__``.
+_LAZY: dict[str, str] = {
+    "RenderedPromptDiff": ".diff",
+    "StructuredPromptDiff": ".diff",
+    "diff_rendered_prompts": ".diff",
+    "diff_structured_prompts": ".diff",
+    "Widget": ".widgets",
+    "WidgetConfig": ".widgets",
+    "get_default_widget_config": ".widgets",
+    "js_prelude": ".widgets",
+    "set_default_widget_config": ".widgets",
+    "setup_notebook": ".widgets",
+}
+
+
+# Submodules that used to be bound as a side effect of the eager ``from .diff import ...``
+# and ``from .widgets import ...``; ``t_prompts.diff`` / ``t_prompts.widgets`` still work.
+_LAZY_SUBMODULES = frozenset({"diff", "widgets"})
+
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported names on first access and cache them in the module namespace."""
+    if name in _LAZY_SUBMODULES:
+        # Importing a submodule binds it on the package, so later lookups skip this hook
+        return importlib.import_module(f".{name}", __name__)
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include lazily exported names in ``dir(t_prompts)``."""
+    return sorted(set(globals()) | set(_LAZY) | _LAZY_SUBMODULES)
+
 
 __version__ = "0.18.2-alpha"
-__all__ = [
+__all__ = (
     "StructuredPrompt",
     "TextInterpolation",
     "ListInterpolation",
@@ -80,4 +127,4 @@ __all__ = [
     "StructuredPromptsError",
     "UnsupportedValueTypeError",
     "__version__",
-]
+)
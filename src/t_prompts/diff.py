@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import functools
+import math
 import re
+from collections import Counter
 from dataclasses import dataclass, field
 from itertools import zip_longest
-from typing import Any, Iterable, Literal, Optional
+from typing import Any, Iterable, Literal, Optional, Sequence
 
 from .element import Element, ImageInterpolation, ListInterpolation, Static, TextInterpolation
 from .ir import ImageChunk, TextChunk
@@ -47,20 +50,17 @@ class NodeDelta:
 
     def summarize(self) -> dict[str, int]:
         stats = {"added": 0, "removed": 0, "modified": 0, "moved": 0}
-        self._accumulate(stats)
+        stack = [self]
+        while stack:
+            delta = stack.pop()
+            name = _SUMMARY_NAMES.get(delta.status)
+            if name is not None:
+                stats[name] += 1
+            stack.extend(delta.children)
         return stats
 
-    def _accumulate(self, stats: dict[str, int]) -> None:
-        if self.status == "inserted":
-            stats["added"] += 1
-        elif self.status == "deleted":
-            stats["removed"] += 1
-        elif self.status == "modified":
-            stats["modified"] += 1
-        elif self.status == "moved":
-            stats["moved"] += 1
-        for child in self.children:
-            child._accumulate(stats)
+
+_SUMMARY_NAMES: dict[str, str] = {"inserted": "added", "deleted": "removed", "modified": "modified", "moved": "moved"}
 
 
 @dataclass(slots=True)
@@ -170,9 +170,13 @@ class ChunkDelta:
     after: TextChunk | ImageChunk | None
 
     def text_delta(self) -> tuple[int, int]:
-        added = len(self.after.text) if self.after is not None else 0
-        removed = len(self.before.text) if self.before is not None else 0
-        return added if self.op in {"insert", "replace"} else 0, removed if self.op in {"delete", "replace"} else 0
+        op = self.op
+        if op == "equal":
+            # Most deltas; skip measuring text (ImageChunk.text formats a placeholder string)
+            return 0, 0
+        added = len(self.after.text) if op != "delete" and self.after is not None else 0
+        removed = len(self.before.text) if op != "insert" and self.before is not None else 0
+        return added, removed
 
 
 @dataclass(slots=True)
@@ -272,20 +276,20 @@ def diff_structured_prompts(before: StructuredPrompt, after: StructuredPrompt) -
     """Compute a structural diff between two StructuredPrompt trees."""
 
     root = _align_nodes(before, after)
-    stats = DiffStats()
-    _collect_stats(root, stats)
-    metrics = _compute_structural_metrics(before, root)
+    stats, metrics = _summarize_structural_diff(before, root)
     return StructuredPromptDiff(before=before, after=after, root=root, stats=stats, metrics=metrics)
 
 
 def diff_rendered_prompts(before: StructuredPrompt, after: StructuredPrompt) -> RenderedPromptDiff:
     """Compute a diff of the rendered intermediate representations."""
 
-    before_chunks = before.ir().chunks
-    after_chunks = after.ir().chunks
-    before_signatures = _build_element_signature_map(before)
-    after_signatures = _build_element_signature_map(after)
-    deltas = _diff_chunks(before_chunks, after_chunks, before_signatures, after_signatures)
+    key_table: dict[tuple[Any, ...], int] = {}
+    path_table: dict[tuple[int, str], int] = {}
+    before_signatures = _build_element_signature_map(before, path_table)
+    after_signatures = _build_element_signature_map(after, path_table)
+    before_columns = _ChunkColumns.build(before.ir().chunks, before_signatures, key_table)
+    after_columns = _ChunkColumns.build(after.ir().chunks, after_signatures, key_table)
+    deltas = _diff_chunks(before_columns, after_columns)
     per_element: dict[str, ElementRenderChange] = {}
     for delta in deltas:
         element_id = _chunk_element(delta)
@@ -303,7 +307,7 @@ def diff_rendered_prompts(before: StructuredPrompt, after: StructuredPrompt) ->
         added, removed = delta.text_delta()
         summary.text_added += added
         summary.text_removed += removed
-    metrics = _compute_rendered_metrics(before_chunks, after_chunks, before_signatures, after_signatures)
+    metrics = _compute_rendered_metrics(before_columns, after_columns)
     return RenderedPromptDiff(
         before=before,
         after=after,
@@ -316,47 +320,33 @@ def diff_rendered_prompts(before: StructuredPrompt, after: StructuredPrompt) ->
 # Internal helpers ------------------------------------------------------------------
 
 
-def _collect_stats(delta: NodeDelta, stats: DiffStats) -> None:
-    if delta.status == "inserted":
-        stats.nodes_added += 1
-    elif delta.status == "deleted":
-        stats.nodes_removed += 1
-    elif delta.status == "modified":
-        stats.nodes_modified += 1
-    elif delta.status == "moved":
-        stats.nodes_moved += 1
-
-    for edit in delta.text_edits:
-        stats.text_added += edit.added_chars()
-        stats.text_removed += edit.removed_chars()
-
-    for child in delta.children:
-        _collect_stats(child, stats)
+def _summarize_structural_diff(before: StructuredPrompt, root: NodeDelta) -> tuple[DiffStats, StructuralDiffMetrics]:
+    """Collect diff stats and structural metrics in a single iterative walk of the delta tree."""
 
-
-def _compute_structural_metrics(before: StructuredPrompt, root: NodeDelta) -> StructuralDiffMetrics:
-    """Derive quantitative metrics summarizing structural diff magnitude."""
-
-    total_chars = _total_rendered_characters(before)
+    stats = DiffStats()
     span_chars = 0
     edit_count = 0.0
     matched_nodes = 0
     moved_nodes = 0
 
-    def visit(delta: NodeDelta) -> None:
-        nonlocal span_chars, edit_count, matched_nodes, moved_nodes
-
-        has_child_changes = any(child.status != "equal" for child in delta.children)
-        has_attr_changes = bool(delta.attr_changes)
-        has_text_changes = bool(delta.text_edits)
-
-        weight = 0.0
-        if delta.status in {"inserted", "deleted", "moved"}:
-            weight = 1.0
-        elif delta.status == "modified":
-            weight = 1.0 if has_child_changes else 0.5
-
-        edit_count += weight
+    stack = [root]
+    while stack:
+        delta = stack.pop()
+        status = delta.status
+
+        if status == "inserted":
+            stats.nodes_added += 1
+            edit_count += 1.0
+        elif status == "deleted":
+            stats.nodes_removed += 1
+            edit_count += 1.0
+        elif status == "moved":
+            stats.nodes_moved += 1
+            edit_count += 1.0
+        elif status == "modified":
+            stats.nodes_modified += 1
+            has_child_changes = any(child.status != "equal" for child in delta.children)
+            edit_count += 1.0 if has_child_changes else 0.5
 
         if delta.before_id is not None and delta.after_id is not None:
             matched_nodes += 1
@@ -367,34 +357,36 @@ def _compute_structural_metrics(before: StructuredPrompt, root: NodeDelta) -> St
             ):
                 moved_nodes += 1
 
-        if has_text_changes or has_attr_changes:
-            for edit in delta.text_edits:
-                if edit.op == "equal":
-                    continue
-                if edit.op == "insert":
-                    span_chars += len(edit.after)
-                elif edit.op == "delete":
-                    span_chars += len(edit.before)
-                else:  # replace
-                    span_chars += max(len(edit.before), len(edit.after))
-
-        for child in delta.children:
-            visit(child)
+        for edit in delta.text_edits:
+            stats.text_added += edit.added_chars()
+            stats.text_removed += edit.removed_chars()
+            if edit.op == "insert":
+                span_chars += len(edit.after)
+            elif edit.op == "delete":
+                span_chars += len(edit.before)
+            elif edit.op == "replace":
+                span_chars += max(len(edit.before), len(edit.after))
 
-    visit(root)
+        stack.extend(delta.children)
 
+    total_chars = _total_rendered_characters(before)
     char_ratio = span_chars / total_chars if total_chars > 0 else 0.0
     order_score = (moved_nodes / matched_nodes) if matched_nodes > 0 else 0.0
 
-    return StructuralDiffMetrics(
+    metrics = StructuralDiffMetrics(
         struct_edit_count=edit_count,
         struct_span_chars=span_chars,
         struct_char_ratio=char_ratio,
         struct_order_score=order_score,
     )
+    return stats, metrics
 
 
-def _align_nodes(before: Optional[Element], after: Optional[Element]) -> NodeDelta:
+def _align_nodes(
+    before: Optional[Element],
+    after: Optional[Element],
+    text_cache: Optional[dict[tuple[str, str], list[TextEdit]]] = None,
+) -> NodeDelta:
     if before is None and after is None:  # pragma: no cover - defensive guard
         raise ValueError("Cannot diff two empty nodes")
 
@@ -420,6 +412,10 @@ def _align_nodes(before: Optional[Element], after: Optional[Element]) -> NodeDel
             after_index=None,
         )
 
+    if before is after:
+        # Same object on both sides (e.g. a prompt diffed against itself): nothing below can differ
+        return _equal_delta(before)
+
     if type(before) is not type(after):
         return NodeDelta(
             status="modified",
@@ -431,10 +427,17 @@ def _align_nodes(before: Optional[Element], after: Optional[Element]) -> NodeDel
             after_index=after.index,
         )
 
+    if text_cache is None:
+        # Shared across the whole walk: repeated fragments (e.g. list item templates) are diffed once
+        text_cache = {}
     attr_changes = _compare_attributes(before, after)
-    text_edits = _diff_text(before, after)
-    child_pairs = _match_children(_iter_children(before), _iter_children(after))
-    child_deltas = [_align_nodes(b, a) for b, a in child_pairs]
+    text_edits = _diff_text(before, after, text_cache)
+    if _node_kind(type(before)) in ("prompt", "list"):
+        child_pairs = _match_children(_iter_children(before), _iter_children(after))
+        child_deltas = [_align_nodes(b, a, text_cache) for b, a in child_pairs]
+    else:
+        # Leaves: skip building the matching lookup, pair list and bookkeeping set for no children
+        child_deltas = []
 
     status: DiffStatus = "equal"
     moved = before.index != after.index
@@ -459,30 +462,79 @@ def _align_nodes(before: Optional[Element], after: Optional[Element]) -> NodeDel
     )
 
 
+def _equal_delta(element: Element) -> NodeDelta:
+    """Build the all-equal delta subtree for an element that is shared by both sides."""
+    return NodeDelta(
+        status="equal",
+        element_type=type(element).__name__,
+        key=element.key,
+        before_id=element.id,
+        after_id=element.id,
+        before_index=element.index,
+        after_index=element.index,
+        children=[_equal_delta(child) for child in _iter_children(element)],
+    )
+
+
+_BASE_ATTR_FIELDS = ("expression", "conversion", "format_spec", "render_hints")
+_ATTR_FIELDS_BY_KIND: dict[str, tuple[str, ...]] = {
+    "list": _BASE_ATTR_FIELDS + ("separator",),
+    "image": _BASE_ATTR_FIELDS + ("value",),  # text values are handled separately by _diff_text
+}
+
+
+@functools.cache
+def _node_kind(node_type: type) -> str:
+    """
+    Classify an element type for diff dispatch.
+
+    The isinstance chain runs once per class; every later node of that class is
+    a single cached lookup on the diff hot path.
+    """
+    if issubclass(node_type, StructuredPrompt):
+        return "prompt"
+    if issubclass(node_type, ListInterpolation):
+        return "list"
+    if issubclass(node_type, (Static, TextInterpolation)):
+        return "text"
+    if issubclass(node_type, ImageInterpolation):
+        return "image"
+    return "other"
+
+
+def _shared_kind(before: Element, after: Element) -> str:
+    kind = _node_kind(type(before))
+    return kind if _node_kind(type(after)) == kind else "other"
+
+
 def _compare_attributes(before: Element, after: Element) -> dict[str, tuple[Any, Any]]:
-    fields = {"expression", "conversion", "format_spec", "render_hints"}
-    if isinstance(before, ListInterpolation) and isinstance(after, ListInterpolation):
-        fields.add("separator")
-    if isinstance(before, (Static, TextInterpolation)) and isinstance(after, (Static, TextInterpolation)):
-        # value handled separately for text diff
-        pass
-    elif isinstance(before, ImageInterpolation) and isinstance(after, ImageInterpolation):
-        fields.add("value")
+    fields = _ATTR_FIELDS_BY_KIND.get(_shared_kind(before, after), _BASE_ATTR_FIELDS)
 
     changes: dict[str, tuple[Any, Any]] = {}
     for field_name in fields:
         before_value = getattr(before, field_name, None)
         after_value = getattr(after, field_name, None)
-        if before_value != after_value:
+        # Identity check first: comparing PIL images with == materializes and compares
+        # their full pixel buffers, which is wasted work when both sides share the object
+        if before_value is not after_value and before_value != after_value:
             changes[field_name] = (before_value, after_value)
     return changes
 
 
-def _diff_text(before: Element, after: Element) -> list[TextEdit]:
-    if isinstance(before, Static) and isinstance(after, Static):
-        return _diff_strings(before.value, after.value)
-    if isinstance(before, TextInterpolation) and isinstance(after, TextInterpolation):
-        return _diff_strings(before.value, after.value)
+def _diff_text(
+    before: Element, after: Element, cache: Optional[dict[tuple[str, str], list[TextEdit]]] = None
+) -> list[TextEdit]:
+    if type(before) is type(after) and _node_kind(type(before)) == "text":
+        before_text = before.value
+        after_text = after.value
+        if cache is None or before_text == after_text:
+            return _diff_strings(before_text, after_text)
+        pair = (before_text, after_text)
+        edits = cache.get(pair)
+        if edits is None:
+            edits = cache[pair] = _diff_strings(*pair)
+        # Each node gets its own list; the TextEdit records themselves are shared
+        return list(edits)
     return []
 
 
@@ -490,102 +542,273 @@ def _diff_strings(before: str, after: str) -> list[TextEdit]:
     if before == after:
         return []
 
-    # Simple character-level diff using SequenceMatcher to keep implementation lightweight
-    from difflib import SequenceMatcher
-
-    matcher = SequenceMatcher(a=before, b=after, autojunk=False)
+    # Character-level diff; leaf payloads usually differ by a few edits, which Myers handles in O((N+M)D)
     edits: list[TextEdit] = []
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in _sequence_opcodes(before, after):
         edits.append(TextEdit(tag, before[i1:i2], after[j1:j2]))
     return edits
 
 
-def _iter_children(element: Element) -> Iterable[Element]:
-    if isinstance(element, StructuredPrompt):
+def _sequence_opcodes(before: Sequence[Any], after: Sequence[Any]) -> list[tuple[str, int, int, int, int]]:
+    """
+    Return SequenceMatcher-style opcodes, trimming the common prefix and suffix first.
+
+    Prompt revisions usually differ in a small region, so only the differing middle is
+    matched. The middle gets a minimal edit script from Myers' algorithm, falling back to
+    SequenceMatcher when the inputs are too different for Myers to finish cheaply.
+    """
+    before_len = len(before)
+    after_len = len(after)
+    limit = min(before_len, after_len)
+
+    prefix = 0
+    while prefix < limit and before[prefix] == after[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and before[before_len - 1 - suffix] == after[after_len - 1 - suffix]:
+        suffix += 1
+
+    opcodes: list[tuple[str, int, int, int, int]] = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    before_end = before_len - suffix
+    after_end = after_len - suffix
+    if prefix < before_end or prefix < after_end:
+        middle_before = before[prefix:before_end]
+        middle_after = after[prefix:after_end]
+        middle = _myers_opcodes(middle_before, middle_after)
+        if middle is None:
+            # Imported here: the fallback rarely runs, so importing t_prompts.diff skips difflib
+            from difflib import SequenceMatcher
+
+            middle = SequenceMatcher(a=middle_before, b=middle_after, autojunk=False).get_opcodes()
+        for tag, i1, i2, j1, j2 in middle:
+            opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(("equal", before_end, before_len, after_end, after_len))
+    return opcodes
+
+
+# Myers costs O(D^2) here, SequenceMatcher roughly O(N*M) on dissimilar input. Myers gives up
+# once D exceeds sqrt(_MYERS_EDIT_SCALE * (N + M)), keeping a failed attempt linear in the input
+# size; the floor keeps short strings minimal and the ceiling bounds the stored trace.
+_MYERS_EDIT_SCALE = 8
+_MYERS_MIN_EDITS = 32
+_MYERS_MAX_EDITS = 1000
+
+
+def _myers_opcodes(before: Sequence[Any], after: Sequence[Any]) -> Optional[list[tuple[str, int, int, int, int]]]:
+    """
+    Return SequenceMatcher-style opcodes for a minimal edit script (Myers' O((N+M)D) diff).
+
+    Adjacent deletes and inserts between two matches are coalesced into one "replace".
+    Returns None when the edit distance exceeds ``isqrt(_MYERS_EDIT_SCALE * (n + m))``
+    (clamped to ``_MYERS_MIN_EDITS``..``_MYERS_MAX_EDITS``), i.e. when the inputs are too
+    different for Myers to beat SequenceMatcher. Largely rewritten inputs are usually
+    rejected up front by a linear lower bound on the edit distance.
+    """
+    n = len(before)
+    m = len(after)
+    max_d = min(n + m, _MYERS_MAX_EDITS, max(_MYERS_MIN_EDITS, math.isqrt(_MYERS_EDIT_SCALE * (n + m))))
+    if max_d < n + m:
+        # Every insert or delete changes one item count by one, so the summed count
+        # differences bound the edit distance from below
+        counts = Counter(before)
+        counts.subtract(after)
+        if sum(map(abs, counts.values())) > max_d:
+            return None
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    # Snapshot of v (diagonals -d..d) taken before each round d, stored back to back:
+    # round d starts at d * d, so no per-round list is allocated
+    history: list[int] = []
+
+    for d in range(max_d + 1):
+        history.extend(v[offset - d : offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and before[x] == after[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(history, d, n, m)
+    return None
+
+
+def _myers_backtrack(history: list[int], edits: int, n: int, m: int) -> list[tuple[str, int, int, int, int]]:
+    """Walk the Myers round snapshots backwards from (n, m) and build coalesced opcodes."""
+    # Each step is (matched run start x/y, run length, edit kind or None)
+    steps: list[tuple[int, int, int, Optional[str]]] = []
+    x, y = n, m
+    for d in range(edits, 0, -1):
+        base = d * d + d  # index of diagonal 0 in round d's snapshot
+        k = x - y
+        if k == -d or (k != d and history[base + k - 1] < history[base + k + 1]):
+            prev_x = history[base + k + 1]
+            prev_y = prev_x - k - 1
+            mid_x, mid_y, kind = prev_x, prev_y + 1, "insert"
+        else:
+            prev_x = history[base + k - 1]
+            prev_y = prev_x - k + 1
+            mid_x, mid_y, kind = prev_x + 1, prev_y, "delete"
+        steps.append((mid_x, mid_y, x - mid_x, None))
+        steps.append((prev_x, prev_y, 1, kind))
+        x, y = prev_x, prev_y
+    steps.append((0, 0, x, None))
+
+    opcodes: list[tuple[str, int, int, int, int]] = []
+    i = j = 0
+    del_start = ins_start = -1
+
+    def flush() -> None:
+        if del_start >= 0 and ins_start >= 0:
+            opcodes.append(("replace", del_start, i, ins_start, j))
+        elif del_start >= 0:
+            opcodes.append(("delete", del_start, i, j, j))
+        elif ins_start >= 0:
+            opcodes.append(("insert", i, i, ins_start, j))
+
+    for start_x, start_y, length, kind in reversed(steps):
+        if kind is None:
+            if not length:
+                continue
+            flush()
+            del_start = ins_start = -1
+            if opcodes and opcodes[-1][0] == "equal":
+                opcodes[-1] = ("equal", opcodes[-1][1], start_x + length, opcodes[-1][3], start_y + length)
+            else:
+                opcodes.append(("equal", start_x, start_x + length, start_y, start_y + length))
+            i, j = start_x + length, start_y + length
+        elif kind == "delete":
+            if del_start < 0:
+                del_start = start_x
+            i = start_x + 1
+        else:
+            if ins_start < 0:
+                ins_start = start_y
+            j = start_y + 1
+    flush()
+    return opcodes
+
+
+def _iter_children(element: Element) -> Sequence[Element]:
+    # Returns the stored tuple/list itself (no copy); callers only read it
+    kind = _node_kind(type(element))
+    if kind == "prompt":
         return element.children
-    if isinstance(element, ListInterpolation):
+    if kind == "list":
         return element.item_elements
     return ()
 
 
 def _match_children(
-    before_children: Iterable[Element], after_children: Iterable[Element]
+    before_list: Sequence[Element], after_list: Sequence[Element]
 ) -> list[tuple[Optional[Element], Optional[Element]]]:
-    before_list = list(before_children)
-    after_list = list(after_children)
 
+    # Buckets are filled back to front so pop() hands out repeated keys (allow_duplicate_keys)
+    # in original order in O(1)
     lookup: dict[tuple[Any, type], list[tuple[int, Element]]] = {}
-    for idx, child in enumerate(after_list):
-        lookup.setdefault((child.key, type(child)), []).append((idx, child))
-
-    used_after: set[int] = set()
+    for idx in range(len(after_list) - 1, -1, -1):
+        child = after_list[idx]
+        bucket = lookup.get((child.key, type(child)))
+        if bucket is None:
+            lookup[(child.key, type(child))] = bucket = []
+        bucket.append((idx, child))
+
+    matched_after = [False] * len(after_list)
     pairs: list[tuple[Optional[Element], Optional[Element]]] = []
 
     for before_child in before_list:
         bucket = lookup.get((before_child.key, type(before_child)))
         if bucket:
-            idx, match = bucket.pop(0)
-            used_after.add(idx)
+            idx, match = bucket.pop()
+            matched_after[idx] = True
             pairs.append((before_child, match))
         else:
             pairs.append((before_child, None))
 
-    for idx, child in enumerate(after_list):
-        if idx not in used_after:
-            pairs.append((None, child))
-
+    pairs.extend([(None, child) for child, matched in zip(after_list, matched_after) if not matched])
     return pairs
 
 
-def _diff_chunks(
-    before: Iterable[TextChunk | ImageChunk],
-    after: Iterable[TextChunk | ImageChunk],
-    before_signatures: dict[str, tuple[str, ...]],
-    after_signatures: dict[str, tuple[str, ...]],
-) -> list[ChunkDelta]:
-    from difflib import SequenceMatcher
+@dataclass(slots=True)
+class _ChunkColumns:
+    """
+    Column-oriented view of a rendered chunk sequence.
+
+    The rendered diff reads each chunk's text and structural signature several times
+    (sequence matching, equality checks, metrics). Building these parallel lists once
+    per side avoids recomputing signatures and ImageChunk placeholder text per pass.
 
-    before_list = list(before)
-    after_list = list(after)
-    before_keys = [_chunk_signature(chunk, before_signatures) for chunk in before_list]
-    after_keys = [_chunk_signature(chunk, after_signatures) for chunk in after_list]
-    matcher = SequenceMatcher(a=before_keys, b=after_keys, autojunk=False)
+    Signatures are interned to small integers through a ``key_table`` shared by both
+    sides, so sequence matching hashes and compares ints instead of (chunk class, path)
+    tuples.
+    """
+
+    chunks: list[TextChunk | ImageChunk]
+    texts: list[str]
+    keys: list[int]
+
+    @classmethod
+    def build(
+        cls,
+        chunks: Iterable[TextChunk | ImageChunk],
+        signatures: dict[str, int],
+        key_table: dict[tuple[Any, ...], int],
+    ) -> _ChunkColumns:
+        chunk_list = list(chunks)
+        keys = []
+        for chunk in chunk_list:
+            signature = _chunk_signature(chunk, signatures)
+            keys.append(key_table.setdefault(signature, len(key_table)))
+        return cls(chunks=chunk_list, texts=[chunk.text for chunk in chunk_list], keys=keys)
+
+
+def _diff_chunks(before: _ChunkColumns, after: _ChunkColumns) -> list[ChunkDelta]:
+    before_list = before.chunks
+    after_list = after.chunks
+    before_texts = before.texts
+    after_texts = after.texts
     deltas: list[ChunkDelta] = []
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    # Keys are interned ints; Myers matching scales with the number of changed chunks, not N*M
+    for tag, i1, i2, j1, j2 in _sequence_opcodes(before.keys, after.keys):
         if tag == "equal":
-            # Chunks matched by structure, but verify text equality
-            for before_chunk, after_chunk in zip(before_list[i1:i2], after_list[j1:j2]):
-                if before_chunk.text == after_chunk.text:
-                    deltas.append(ChunkDelta("equal", before_chunk, after_chunk))
-                else:
-                    # Same structure, different text -> replace
-                    deltas.append(ChunkDelta("replace", before_chunk, after_chunk))
+            # Chunks matched by structure, but verify text equality (same structure, different text -> replace)
+            deltas.extend(
+                [
+                    ChunkDelta("equal" if before_text == after_text else "replace", before_chunk, after_chunk)
+                    for before_chunk, after_chunk, before_text, after_text in zip(
+                        before_list[i1:i2], after_list[j1:j2], before_texts[i1:i2], after_texts[j1:j2]
+                    )
+                ]
+            )
             continue
 
         if tag == "replace":
-            before_slice = before_list[i1:i2]
-            after_slice = after_list[j1:j2]
-            for before_chunk, after_chunk in zip_longest(before_slice, after_slice):
-                if before_chunk is None:
-                    deltas.append(ChunkDelta("insert", None, after_chunk))
-                elif after_chunk is None:
-                    deltas.append(ChunkDelta("delete", before_chunk, None))
-                elif before_chunk.text == after_chunk.text:
+            for i, j in zip_longest(range(i1, i2), range(j1, j2)):
+                if i is None:
+                    deltas.append(ChunkDelta("insert", None, after_list[j]))
+                elif j is None:
+                    deltas.append(ChunkDelta("delete", before_list[i], None))
+                elif before_texts[i] == after_texts[j]:
                     # Different structure but same text -> still equal
-                    deltas.append(ChunkDelta("equal", before_chunk, after_chunk))
+                    deltas.append(ChunkDelta("equal", before_list[i], after_list[j]))
                 else:
-                    deltas.append(ChunkDelta("replace", before_chunk, after_chunk))
+                    deltas.append(ChunkDelta("replace", before_list[i], after_list[j]))
             continue
 
         if tag == "delete":
-            for chunk in before_list[i1:i2]:
-                deltas.append(ChunkDelta("delete", chunk, None))
+            deltas.extend([ChunkDelta("delete", chunk, None) for chunk in before_list[i1:i2]])
             continue
 
         if tag == "insert":
-            for chunk in after_list[j1:j2]:
-                deltas.append(ChunkDelta("insert", None, chunk))
+            deltas.extend([ChunkDelta("insert", None, chunk) for chunk in after_list[j1:j2]])
 
     return deltas
 
@@ -598,26 +821,20 @@ def _chunk_element(delta: ChunkDelta) -> Optional[str]:
     return None
 
 
-def _compute_rendered_metrics(
-    before_chunks: Iterable[TextChunk | ImageChunk],
-    after_chunks: Iterable[TextChunk | ImageChunk],
-    before_signatures: dict[str, tuple[str, ...]],
-    after_signatures: dict[str, tuple[str, ...]],
-) -> RenderedDiffMetrics:
-    before_list = list(before_chunks)
-    after_list = list(after_chunks)
-
-    before_text = "".join(chunk.text for chunk in before_list if isinstance(chunk, TextChunk))
-    after_text = "".join(chunk.text for chunk in after_list if isinstance(chunk, TextChunk))
+def _compute_rendered_metrics(before: _ChunkColumns, after: _ChunkColumns) -> RenderedDiffMetrics:
+    before_text = "".join([text for chunk, text in zip(before.chunks, before.texts) if isinstance(chunk, TextChunk)])
+    after_text = "".join([text for chunk, text in zip(after.chunks, after.texts) if isinstance(chunk, TextChunk)])
     non_ws_delta, ws_delta = _token_delta_counts(before_text, after_text)
 
-    before_sig_set = {_chunk_signature(chunk, before_signatures) for chunk in before_list}
-    after_sig_set = {_chunk_signature(chunk, after_signatures) for chunk in after_list}
-    union = before_sig_set | after_sig_set
-    if not union:
+    # Keys are interned ints; derive the union size from the intersection instead of building it
+    before_sig_set = set(before.keys)
+    after_sig_set = set(after.keys)
+    shared = len(before_sig_set.intersection(after_sig_set))
+    union_size = len(before_sig_set) + len(after_sig_set) - shared
+    if not union_size:
         chunk_drift = 0.0
     else:
-        chunk_drift = 1.0 - (len(before_sig_set & after_sig_set) / len(union))
+        chunk_drift = 1.0 - (shared / union_size)
 
     return RenderedDiffMetrics(
         render_token_delta=non_ws_delta,
@@ -627,38 +844,43 @@ def _compute_rendered_metrics(
     )
 
 
-def _build_element_signature_map(prompt: StructuredPrompt) -> dict[str, tuple[str, ...]]:
+def _build_element_signature_map(prompt: StructuredPrompt, path_table: dict[tuple[int, str], int]) -> dict[str, int]:
     """
     Build a stable signature map for elements within a prompt.
 
     Chunk IDs change on clone, so we rely on structural paths composed of element type,
     key, and index to align identical content between prompts.
-    """
 
-    signatures: dict[str, tuple[str, ...]] = {}
+    Paths are interned incrementally: each element's path is the id of its
+    ``(parent path id, segment)`` pair in ``path_table``, so two elements get the same id
+    exactly when their full root-to-element paths match. Share one table between the
+    prompts being compared. This avoids copying the ancestor tuple at every node.
+    """
 
-    def visit(element: Element, path: tuple[str, ...]) -> None:
+    signatures: dict[str, int] = {}
+    stack: list[tuple[Element, int]] = [(prompt, -1)]
+    while stack:
+        element, parent_path = stack.pop()
         key_repr = "<root>" if element.key is None else str(element.key)
-        segment = f"{type(element).__name__}:{key_repr}:{element.index}"
-        current_path = path + (segment,)
-        signatures[element.id] = current_path
-        for child in _iter_children(element):
-            visit(child, current_path)
-
-    visit(prompt, ())
+        node = (parent_path, f"{type(element).__name__}:{key_repr}:{element.index}")
+        path = path_table.get(node)
+        if path is None:
+            path = path_table[node] = len(path_table)
+        signatures[element.id] = path
+        stack.extend([(child, path) for child in _iter_children(element)])
     return signatures
 
 
-def _chunk_signature(chunk: TextChunk | ImageChunk, signatures: dict[str, tuple[str, ...]]) -> tuple[Any, ...]:
+def _chunk_signature(chunk: TextChunk | ImageChunk, signatures: dict[str, int]) -> tuple[Any, ...]:
     """
     Generate a signature for chunk matching based on structural position only.
 
     Text content is intentionally excluded so that chunks at the same structural
     position can be matched together, even if their text differs. Text equality
-    is checked separately after matching.
+    is checked separately after matching. The chunk class itself (not its name) is
+    used, since signatures only serve as hash keys for interning.
     """
-    path = signatures.get(chunk.element_id)
-    return (type(chunk).__name__, path)
+    return (type(chunk), signatures.get(chunk.element_id))
 
 
 _TOKEN_SPLIT_PATTERN = re.compile(r"\s+|\S+")
@@ -667,32 +889,26 @@ _TOKEN_SPLIT_PATTERN = re.compile(r"\s+|\S+")
 def _token_delta_counts(before_text: str, after_text: str) -> tuple[int, int]:
     """Return counts of non-whitespace and whitespace token churn."""
 
-    from difflib import SequenceMatcher
-
     before_tokens = _TOKEN_SPLIT_PATTERN.findall(before_text)
     after_tokens = _TOKEN_SPLIT_PATTERN.findall(after_text)
-    matcher = SequenceMatcher(a=before_tokens, b=after_tokens, autojunk=False)
 
     non_ws = 0
     ws = 0
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in _sequence_opcodes(before_tokens, after_tokens):
         if tag == "equal":
             continue
 
-        if tag in {"replace", "delete"}:
-            for token in before_tokens[i1:i2]:
-                if token.isspace():
-                    ws += 1
-                else:
-                    non_ws += 1
+        # Tokens are whole whitespace or non-whitespace runs; count the whitespace ones at C level
+        if tag != "insert":
+            changed_ws = sum(map(str.isspace, before_tokens[i1:i2]))
+            ws += changed_ws
+            non_ws += (i2 - i1) - changed_ws
 
-        if tag in {"replace", "insert"}:
-            for token in after_tokens[j1:j2]:
-                if token.isspace():
-                    ws += 1
-                else:
-                    non_ws += 1
+        if tag != "delete":
+            changed_ws = sum(map(str.isspace, after_tokens[j1:j2]))
+            ws += changed_ws
+            non_ws += (j2 - j1) - changed_ws
 
     return non_ws, ws
 
@@ -710,6 +926,22 @@ def _total_rendered_characters(prompt: StructuredPrompt) -> int:
 
 def _serialize_node_delta(delta: NodeDelta) -> dict[str, Any]:
     """Serialize NodeDelta to JSON-compatible dict."""
+    # Iterative, so deeply nested prompts cannot hit the recursion limit
+    root = _serialize_node_fields(delta)
+    stack = [(delta, root)]
+    while stack:
+        node, out = stack.pop()
+        children: list[dict[str, Any]] = []
+        out["children"] = children
+        for child in node.children:
+            child_out = _serialize_node_fields(child)
+            children.append(child_out)
+            stack.append((child, child_out))
+    return root
+
+
+def _serialize_node_fields(delta: NodeDelta) -> dict[str, Any]:
+    """Serialize a NodeDelta's own fields; _serialize_node_delta fills in "children"."""
     return {
         "status": delta.status,
         "element_type": delta.element_type,
@@ -720,5 +952,4 @@ def _serialize_node_delta(delta: NodeDelta) -> dict[str, Any]:
         "after_index": delta.after_index,
         "attr_changes": {k: list(v) for k, v in delta.attr_changes.items()},
         "text_edits": [{"op": edit.op, "before": edit.before, "after": edit.after} for edit in delta.text_edits],
-        "children": [_serialize_node_delta(child) for child in delta.children],
     }
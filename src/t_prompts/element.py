@@ -1,17 +1,20 @@
 """Element classes for structured prompts."""
 
 import base64
+import functools
 import io
-import uuid
+import weakref
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Literal, Optional, Union
 
-from .exceptions import NotANestedPromptError
+from .exceptions import NotANestedPromptError, PromptReuseError
+from .ids import _new_id
+from .ir import _DEFAULT_RENDER_CONTEXT, IntermediateRepresentation, RenderContext
+from .parsing import _cached_render_hints
 from .source_location import SourceLocation
 
 if TYPE_CHECKING:
-    from .ir import IntermediateRepresentation, RenderContext
     from .structured_prompt import StructuredPrompt
 
 # Type alias for interpolation return types to keep lines under 120 chars
@@ -35,6 +38,47 @@ def convert(value: str, conversion: Literal["r", "s", "a"]) -> str:
     return value
 
 
+@functools.lru_cache(maxsize=256)
+def _xml_wrappers(xml_tag: str) -> tuple[str, str]:
+    """
+    Return the opening and closing tags for an xml render hint.
+
+    Prompts reuse a small set of tags, so the pair is built once per tag
+    instead of formatting two strings on every render.
+
+    Parameters
+    ----------
+    xml_tag : str
+        Tag name from the ``xml=`` render hint.
+
+    Returns
+    -------
+    tuple[str, str]
+        The ``<tag>`` and ``</tag>`` strings.
+    """
+    return f"<{xml_tag}>", f"</{xml_tag}>"
+
+
+@functools.lru_cache(maxsize=1024)
+def _header_line(header_level: int, header: str) -> str:
+    """
+    Return the markdown header line (with trailing newline) for a header render hint.
+
+    Parameters
+    ----------
+    header_level : int
+        Number of ``#`` characters, already clamped to the maximum level.
+    header : str
+        Header text from the ``header=`` render hint.
+
+    Returns
+    -------
+    str
+        The header line including its trailing newline, e.g. ``## Title``.
+    """
+    return f"{'#' * header_level} {header}\n"
+
+
 def apply_render_hints(
     ir: "IntermediateRepresentation",
     hints: dict[str, str],
@@ -68,17 +112,49 @@ def apply_render_hints(
     """
     # Apply XML wrapper (inner) - wraps the entire content
     if "xml" in hints:
-        xml_tag = hints["xml"]
-        ir = ir.wrap(f"<{xml_tag}>", f"</{xml_tag}>", element_id, escape_wrappers=True)
+        xml_open, xml_close = _xml_wrappers(hints["xml"])
+        ir = ir.wrap(xml_open, xml_close, element_id, escape_wrappers=True)
 
     # Apply header (outer) - wraps after XML, only prepends
     if "header" in hints:
-        header_level = min(level, max_level)
-        ir = ir.wrap(f"{'#' * header_level} {hints['header']}\n", "", element_id, escape_wrappers=False)
+        ir = ir.wrap(_header_line(min(level, max_level), hints["header"]), "", element_id, escape_wrappers=False)
 
     return ir
 
 
+def apply_render_hints_text(text: str, hints: dict[str, str], level: int, max_level: int) -> str:
+    """
+    Apply render hints (xml wrapper, header) directly to rendered text.
+
+    String counterpart of apply_render_hints, used by the text-only render path.
+    Must produce exactly the text of the wrapped IR.
+
+    Parameters
+    ----------
+    text : str
+        The rendered text to wrap.
+    hints : dict[str, str]
+        Parsed render hints dictionary (from parse_render_hints).
+    level : int
+        Current header level from RenderContext.
+    max_level : int
+        Maximum header level from RenderContext.
+
+    Returns
+    -------
+    str
+        Text with render hints applied.
+    """
+    if "xml" in hints:
+        xml_open, xml_close = _xml_wrappers(hints["xml"])
+        text = xml_open + text + xml_close
+
+    if "header" in hints:
+        text = _header_line(min(level, max_level), hints["header"]) + text
+
+    return text
+
+
 # Try to import PIL for image support (optional dependency)
 try:
     from PIL import Image as PILImage
@@ -88,6 +164,15 @@ except ImportError:
     PILImage = None  # type: ignore
     HAS_PIL = False
 
+# Use pybase64's SIMD encoder for image payloads when it is installed (optional accelerator)
+try:
+    from pybase64 import b64encode_as_string as _b64encode_as_string
+except ImportError:
+
+    def _b64encode_as_string(data: Any) -> str:
+        """Base64-encode a bytes-like object to an ASCII string (stdlib fallback)."""
+        return base64.b64encode(data).decode("ascii")
+
 
 @dataclass(slots=True)
 class Element(ABC):
@@ -117,7 +202,7 @@ class Element(ABC):
     parent: Optional["StructuredPrompt"] = None
     index: int = 0
     source_location: Optional[SourceLocation] = None
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     metadata: dict[str, Any] = field(default_factory=dict)
 
     # Interpolation fields (None for Static and non-interpolated StructuredPrompts)
@@ -162,62 +247,85 @@ class Element(ABC):
         """
         pass
 
-    def _base_json_dict(self) -> dict[str, Any]:
+    def _render_text(self, ctx: Optional["RenderContext"] = None) -> str:
         """
-        Get base fields common to all elements.
+        Render this element straight to text without building IR chunks.
+
+        Subclasses override this with a direct string implementation; the result must
+        always equal ``self.ir(ctx).text``. Skipping the IR avoids allocating a chunk
+        object per rendered fragment when only the text is needed.
 
-        Returns a dictionary with the base fields that all elements share:
-        key, index, source_location, id, parent_id, metadata.
+        ``StructuredPrompt.__str__`` renders through this method, not through ``ir()``.
+        A subclass that overrides ``ir()`` without a matching ``_render_text`` (or the
+        other way round) will therefore get ``str()`` output that differs from
+        ``ir().text``.
+
+        Parameters
+        ----------
+        ctx : RenderContext | None, optional
+            Rendering context. If None, uses default context.
+
+        Returns
+        -------
+        str
+            The rendered text.
+        """
+        return self.ir(ctx).text
+
+    def _base_json_dict(self, type_name: str) -> dict[str, Any]:
+        """
+        Get the type tag and base fields common to all elements.
+
+        Returns a dictionary with the fields that all elements share:
+        type, key, index, source_location, id, parent_id, metadata.
+
+        Parameters
+        ----------
+        type_name : str
+            Value for the "type" field.
 
         Returns
         -------
         dict[str, Any]
-            Dictionary with base fields (without "type" field).
+            Dictionary with base fields; callers add their own fields to it.
         """
+        source_location = self.source_location
+        parent = self.parent
         return {
+            "type": type_name,
             "key": self.key,
             "index": self.index,
-            "source_location": self.source_location.toJSON() if self.source_location else None,
+            "source_location": source_location.toJSON() if source_location is not None else None,
             "id": self.id,
-            "parent_id": self.parent.id if self.parent else None,
+            "parent_id": parent.id if parent is not None else None,
             "metadata": self.metadata,
         }
 
-    def _interpolation_json_dict(
-        self,
-        expression: str,
-        conversion: Optional[str],
-        format_spec: str,
-        render_hints: str,
-    ) -> dict[str, Any]:
+    def _interpolation_json_dict(self, type_name: str) -> dict[str, Any]:
         """
-        Get fields common to all interpolation types.
+        Get the base fields plus the fields common to all interpolation types.
 
         This helper returns the fields shared by TextInterpolation,
-        NestedPromptInterpolation, ListInterpolation, and ImageInterpolation.
+        NestedPromptInterpolation, ListInterpolation, and ImageInterpolation:
+        the base fields followed by expression, conversion, format_spec and
+        render_hints.
 
         Parameters
         ----------
-        expression : str
-            The original expression text from the t-string.
-        conversion : str | None
-            The conversion flag if present (!s, !r, !a), or None.
-        format_spec : str
-            The format specification string.
-        render_hints : str
-            Rendering hints parsed from format_spec.
+        type_name : str
+            Value for the "type" field.
 
         Returns
         -------
         dict[str, Any]
-            Dictionary with interpolation fields.
+            Dictionary with base and interpolation fields; callers add their own fields to it.
         """
-        return {
-            "expression": expression,
-            "conversion": conversion,
-            "format_spec": format_spec,
-            "render_hints": render_hints,
-        }
+        data = self._base_json_dict(type_name)
+        data["expression"] = self.expression
+        data["conversion"] = self.conversion
+        data["format_spec"] = self.format_spec
+        data["render_hints"] = self.render_hints
+        return data
 
     @abstractmethod
     def toJSON(self) -> dict[str, Any]:
@@ -273,10 +381,9 @@ class Static(Element):
         IntermediateRepresentation
             IR with a single TextChunk (if non-empty).
         """
-        from .ir import IntermediateRepresentation, RenderContext
 
         if ctx is None:
-            ctx = RenderContext(path=(), header_level=1, max_header_level=4)
+            ctx = _DEFAULT_RENDER_CONTEXT
 
         if not self.value:
             # Empty static - return empty IR
@@ -285,6 +392,10 @@ class Static(Element):
         # Use from_text factory method for simple text
         return IntermediateRepresentation.from_text(self.value, self.id)
 
+    def _render_text(self, ctx: Optional["RenderContext"] = None) -> str:
+        """Render static text directly (see Element._render_text)."""
+        return self.value
+
     def toJSON(self) -> dict[str, Any]:
         """
         Convert Static element to JSON-serializable dictionary.
@@ -294,11 +405,9 @@ class Static(Element):
         dict[str, Any]
             Dictionary with type, key, index, source_location, id, value, parent_id, metadata.
         """
-        return {
-            "type": "Static",
-            **self._base_json_dict(),
-            "value": self.value,
-        }
+        data = self._base_json_dict("Static")
+        data["value"] = self.value
+        return data
 
 
 @dataclass(slots=True)
@@ -365,14 +474,12 @@ class TextInterpolation(Element):
         IntermediateRepresentation
             IR with chunks including any wrappers.
         """
-        from .ir import IntermediateRepresentation, RenderContext
-        from .parsing import parse_render_hints
 
         if ctx is None:
-            ctx = RenderContext(path=(), header_level=1, max_header_level=4)
+            ctx = _DEFAULT_RENDER_CONTEXT
 
         # Parse render hints
-        hints = parse_render_hints(self.render_hints, str(self.key))
+        hints = _cached_render_hints(self.render_hints, str(self.key))
 
         # String value - apply conversion if needed
         text = self.value
@@ -386,6 +493,19 @@ class TextInterpolation(Element):
 
         return result_ir
 
+    def _render_text(self, ctx: Optional["RenderContext"] = None) -> str:
+        """Render converted text with render hints directly (see Element._render_text)."""
+
+        if ctx is None:
+            ctx = _DEFAULT_RENDER_CONTEXT
+
+        hints = _cached_render_hints(self.render_hints, str(self.key))
+        text = self.value
+        if self.conversion:
+            conv: Literal["r", "s", "a"] = self.conversion  # type: ignore
+            text = convert(text, conv)
+        return apply_render_hints_text(text, hints, ctx.header_level, ctx.max_header_level)
+
     def __repr__(self) -> str:
         """Return a helpful debug representation."""
         return (
@@ -404,12 +524,9 @@ class TextInterpolation(Element):
             Dictionary with type, key, index, source_location, id, expression,
             conversion, format_spec, render_hints, value, parent_id, metadata.
         """
-        return {
-            "type": "TextInterpolation",
-            **self._base_json_dict(),
-            **self._interpolation_json_dict(self.expression, self.conversion, self.format_spec, self.render_hints),
-            "value": self.value,
-        }
+        data = self._interpolation_json_dict("TextInterpolation")
+        data["value"] = self.value
+        return data
 
 
 @dataclass(slots=True)
@@ -453,7 +570,6 @@ class ListInterpolation(Element):
 
     def __post_init__(self) -> None:
         """Attach list items directly without wrappers."""
-        from .exceptions import PromptReuseError
 
         # Get items from temporary field
         items = object.__getattribute__(self, "items")
@@ -549,17 +665,16 @@ class ListInterpolation(Element):
         IntermediateRepresentation
             IR with flattened chunks from all items, with wrappers applied.
         """
-        from .ir import IntermediateRepresentation, RenderContext
-        from .parsing import parse_render_hints
 
         if ctx is None:
-            ctx = RenderContext(path=(), header_level=1, max_header_level=4)
+            ctx = _DEFAULT_RENDER_CONTEXT
 
         # Parse render hints
-        hints = parse_render_hints(self.render_hints, str(self.key))
+        hints = _cached_render_hints(self.render_hints, str(self.key))
 
-        # Render each item directly (items are now StructuredPrompts, not wrappers)
-        item_irs = [item.ir(ctx) for item in self.item_elements]
+        # Render each item directly (items are now StructuredPrompts, not wrappers);
+        # merge consumes the generator, so the item IRs are never held in a list
+        item_irs = (item.ir(ctx) for item in self.item_elements)
 
         # Merge items with separator using chunk-based merge operation
         # The separator chunks will have element_id = self.id (the ListInterpolation)
@@ -570,6 +685,16 @@ class ListInterpolation(Element):
 
         return result_ir
 
+    def _render_text(self, ctx: Optional["RenderContext"] = None) -> str:
+        """Render items joined by the separator with render hints directly (see Element._render_text)."""
+
+        if ctx is None:
+            ctx = _DEFAULT_RENDER_CONTEXT
+
+        hints = _cached_render_hints(self.render_hints, str(self.key))
+        text = self.separator.join([item._render_text(ctx) for item in self.item_elements])
+        return apply_render_hints_text(text, hints, ctx.header_level, ctx.max_header_level)
+
     def __repr__(self) -> str:
         """Return a helpful debug representation."""
         return (
@@ -590,13 +715,10 @@ class ListInterpolation(Element):
             Dictionary with type, key, index, source_location, id, expression,
             conversion, format_spec, render_hints, item_ids, separator, parent_id, metadata.
         """
-        return {
-            "type": "ListInterpolation",
-            **self._base_json_dict(),
-            **self._interpolation_json_dict(self.expression, self.conversion, self.format_spec, self.render_hints),
-            "item_ids": [item.id for item in self.item_elements],
-            "separator": self.separator,
-        }
+        data = self._interpolation_json_dict("ListInterpolation")
+        data["item_ids"] = [item.id for item in self.item_elements]
+        data["separator"] = self.separator
+        return data
 
 
 @dataclass(slots=True)
@@ -646,10 +768,9 @@ class ImageInterpolation(Element):
         IntermediateRepresentation
             IR with a single ImageChunk.
         """
-        from .ir import IntermediateRepresentation, RenderContext
 
         if ctx is None:
-            ctx = RenderContext(path=(), header_level=1, max_header_level=4)
+            ctx = _DEFAULT_RENDER_CONTEXT
 
         # Use from_image factory method for images
         return IntermediateRepresentation.from_image(self.value, self.id)
@@ -674,18 +795,28 @@ class ImageInterpolation(Element):
             Dictionary with type, key, index, source_location, id, expression,
             conversion, format_spec, render_hints, value, parent_id, metadata.
         """
-        return {
-            "type": "ImageInterpolation",
-            **self._base_json_dict(),
-            **self._interpolation_json_dict(self.expression, self.conversion, self.format_spec, self.render_hints),
-            "value": _serialize_image(self.value),
-        }
+        data = self._interpolation_json_dict("ImageInterpolation")
+        data["value"] = _serialize_image(self.value)
+        return data
+
+
+# Serialized images keyed by id(image): (fingerprint, payload). Entries are evicted when the image is collected.
+_IMAGE_CACHE: dict[int, tuple[tuple[Any, ...], dict[str, Any]]] = {}
 
 
 def _serialize_image(image: Any) -> dict[str, Any]:
     """
     Serialize a PIL Image to a JSON-compatible dict with base64 data and metadata.
 
+    PNG encoding and base64 are expensive, so results are cached per image object.
+    A cached payload is reused only while the image's mode, size, format, palette and
+    pixel data are unchanged, so images edited in place are re-encoded.
+
+    Checking the pixel data is not free: every call, cache hits included, copies the
+    whole pixel buffer into a new bytes object with ``image.tobytes()`` and hashes it.
+    That is a linear pass over the raw pixels (a few ms for a megapixel RGB image),
+    still several times cheaper than PNG compression plus base64.
+
     Parameters
     ----------
     image : PIL.Image.Image
@@ -699,6 +830,44 @@ def _serialize_image(image: Any) -> dict[str, Any]:
     if not HAS_PIL or PILImage is None:
         return {"error": "PIL not available"}
 
+    try:
+        fingerprint = (image.mode, image.size, image.format, image.getpalette(), hash(image.tobytes()))
+    except Exception:
+        return _encode_image(image)
+
+    key = id(image)
+    cached = _IMAGE_CACHE.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return dict(cached[1])
+
+    data = _encode_image(image)
+    if "error" in data:
+        return data
+
+    if cached is None:
+        try:
+            weakref.finalize(image, _IMAGE_CACHE.pop, key, None)
+        except TypeError:
+            # Not weak-referenceable: we could not tell when the id is reused, so don't cache
+            return data
+    _IMAGE_CACHE[key] = (fingerprint, data)
+    return dict(data)
+
+
+def _encode_image(image: Any) -> dict[str, Any]:
+    """
+    Encode a PIL Image to base64 and collect its metadata (uncached).
+
+    Parameters
+    ----------
+    image : PIL.Image.Image
+        The PIL Image object to serialize.
+
+    Returns
+    -------
+    dict[str, Any]
+        Dictionary with base64_data, format, width, height and mode, or an error entry.
+    """
     try:
         # Get image metadata
         width, height = image.size
@@ -708,7 +877,9 @@ def _serialize_image(image: Any) -> dict[str, Any]:
         # Encode image to base64
         buffer = io.BytesIO()
         image.save(buffer, format=img_format)
-        base64_data = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        # Encode straight from the buffer's memory instead of copying it out with getvalue()
+        with buffer.getbuffer() as data:
+            base64_data = _b64encode_as_string(data)
 
         return {
             "base64_data": base64_data,
@@ -1,5 +1,20 @@
 """Custom exceptions for structured-prompts."""
 
+from collections.abc import Collection
+from typing import Any
+
+__all__ = (
+    "StructuredPromptsError",
+    "UnsupportedValueTypeError",
+    "DuplicateKeyError",
+    "MissingKeyError",
+    "NotANestedPromptError",
+    "EmptyExpressionError",
+    "DedentError",
+    "ImageRenderError",
+    "PromptReuseError",
+)
+
 
 class StructuredPromptsError(Exception):
     """Base exception for all structured-prompts errors."""
@@ -32,10 +47,28 @@ class DuplicateKeyError(StructuredPromptsError):
 class MissingKeyError(StructuredPromptsError, KeyError):
     """Raised when a key is not found during dict-like access."""
 
-    def __init__(self, key: str, available_keys: list[str]):
+    def __init__(self, key: str, available_keys: Collection[str]):
         self.key = key
-        self.available_keys = available_keys
-        super().__init__(f"Key '{key}' not found. Available keys: {', '.join(repr(k) for k in available_keys)}")
+        # Snapshot as a tuple so the exception does not hold a live view into the prompt's index
+        self.available_keys = tuple(available_keys)
+        super().__init__(key)
+
+    # The message lists every key, so it is formatted on demand: callers that catch the miss
+    # and move on never pay for it. args and repr still expose the full message as before.
+    @property
+    def args(self) -> tuple[Any, ...]:
+        args = BaseException.args.__get__(self)
+        return (str(self),) if args == (self.key,) else args
+
+    @args.setter
+    def args(self, value: tuple[Any, ...]) -> None:
+        BaseException.args.__set__(self, value)
+
+    def __str__(self) -> str:
+        return f"Key '{self.key}' not found. Available keys: {', '.join(repr(k) for k in self.available_keys)}"
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
 
 
 class NotANestedPromptError(StructuredPromptsError):
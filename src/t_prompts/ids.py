@@ -0,0 +1,39 @@
+"""Cheap unique identifiers for elements, chunks, and intermediate representations."""
+
+import itertools
+import os
+import uuid
+
+_prefix = ""
+_counter = itertools.count()
+
+
+def _reseed() -> None:
+    """Draw a fresh random prefix and restart the counter."""
+    global _prefix, _counter
+    # The first 24 characters of a random UUID4 carry its version/variant bits and
+    # ~74 random bits; the last 48-bit field is filled from the counter
+    _prefix = str(uuid.uuid4())[:24]
+    _counter = itertools.count()
+
+
+_reseed()
+# Forked workers would otherwise continue the parent's sequence and collide with it
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
+
+
+def _new_id() -> str:
+    """
+    Return a new UUID4-shaped identifier string.
+
+    Ids are unique within the process and, through the random per-process prefix,
+    across processes with high probability. Unlike ``str(uuid.uuid4())`` this needs
+    no ``os.urandom`` call per id, which matters when building large prompt trees.
+
+    Returns
+    -------
+    str
+        Identifier in canonical UUID form (8-4-4-4-12 hex digits).
+    """
+    return f"{_prefix}{next(_counter) & 0xFFFFFFFFFFFF:012x}"
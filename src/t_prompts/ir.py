@@ -1,9 +1,11 @@
 """Intermediate representation for rendered structured prompts."""
 
-import uuid
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Optional, Union
 
+from .ids import _new_id
+
 if TYPE_CHECKING:
     from .element import Element
     from .structured_prompt import StructuredPrompt
@@ -35,7 +37,7 @@ class TextChunk:
 
     text: str
     element_id: str
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     metadata: dict[str, Any] = field(default_factory=dict)
     needs_html_escape: bool = False
 
@@ -79,7 +81,7 @@ class ImageChunk:
 
     image: Any
     element_id: str
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     metadata: dict[str, Any] = field(default_factory=dict)
 
     @property
@@ -146,6 +148,10 @@ class RenderContext:
     max_header_level: int
 
 
+# Shared default for ir()/render calls made without a context; safe because RenderContext is frozen
+_DEFAULT_RENDER_CONTEXT = RenderContext(path=(), header_level=1, max_header_level=4)
+
+
 class IntermediateRepresentation:
     """
     Lightweight intermediate representation with multi-modal chunks.
@@ -174,6 +180,8 @@ class IntermediateRepresentation:
         Metadata dictionary for storing analysis results and other information.
     """
 
+    __slots__ = ("_id", "_chunks", "_source_prompt", "_metadata")
+
     def __init__(
         self,
         chunks: list[Union[TextChunk, ImageChunk]],
@@ -196,7 +204,7 @@ class IntermediateRepresentation:
         metadata : dict[str, Any] | None, optional
             Metadata dictionary for storing analysis results. If None, creates empty dict.
         """
-        self._id = str(uuid.uuid4())
+        self._id = _new_id()
         self._chunks = chunks
         self._source_prompt = source_prompt
         self._metadata = metadata if metadata is not None else {}
@@ -288,16 +296,14 @@ class IntermediateRepresentation:
                 return IntermediateRepresentation(chunks=[chunk], source_prompt=None)
             return self
 
-        new_chunks = list(self._chunks)
-
-        # Always insert new chunks for prefix/suffix (never modify existing)
+        # Always add new chunks for prefix/suffix (never modify existing).
+        # Built in one pass: inserting at the front would shift every existing chunk again.
+        new_chunks: list[Union[TextChunk, ImageChunk]] = []
         if prefix:
-            prefix_chunk = TextChunk(text=prefix, element_id=wrapper_element_id, needs_html_escape=escape_wrappers)
-            new_chunks.insert(0, prefix_chunk)
-
+            new_chunks.append(TextChunk(text=prefix, element_id=wrapper_element_id, needs_html_escape=escape_wrappers))
+        new_chunks.extend(self._chunks)
         if suffix:
-            suffix_chunk = TextChunk(text=suffix, element_id=wrapper_element_id, needs_html_escape=escape_wrappers)
-            new_chunks.append(suffix_chunk)
+            new_chunks.append(TextChunk(text=suffix, element_id=wrapper_element_id, needs_html_escape=escape_wrappers))
 
         return IntermediateRepresentation(
             chunks=new_chunks,
@@ -308,7 +314,7 @@ class IntermediateRepresentation:
     @classmethod
     def merge(
         cls,
-        irs: list["IntermediateRepresentation"],
+        irs: Iterable["IntermediateRepresentation"],
         separator: str = "",
         separator_element_id: str = "",
     ) -> "IntermediateRepresentation":
@@ -320,8 +326,9 @@ class IntermediateRepresentation:
 
         Parameters
         ----------
-        irs : list[IntermediateRepresentation]
-            List of IRs to merge.
+        irs : Iterable[IntermediateRepresentation]
+            IRs to merge. May be a generator; it is consumed once, so callers
+            need not materialize every IR before merging.
         separator : str, optional
             Separator to insert between IRs (default: "").
         separator_element_id : str, optional
@@ -332,22 +339,24 @@ class IntermediateRepresentation:
         IntermediateRepresentation
             Merged IR with concatenated chunks.
         """
-        if not irs:
+        ir_iter = iter(irs)
+        first = next(ir_iter, None)
+        if first is None:
             return cls.empty()
 
-        if len(irs) == 1:
-            return irs[0]
-
-        all_chunks: list[Union[TextChunk, ImageChunk]] = []
+        second = next(ir_iter, None)
+        if second is None:
+            return first
 
-        for i, ir in enumerate(irs):
+        # Just append existing chunks - no recreation!
+        all_chunks: list[Union[TextChunk, ImageChunk]] = list(first.chunks)
+        ir: Optional[IntermediateRepresentation] = second
+        while ir is not None:
             # Add separator before all IRs except the first
-            if i > 0 and separator:
-                sep_chunk = TextChunk(text=separator, element_id=separator_element_id)
-                all_chunks.append(sep_chunk)
-
-            # Just append existing chunks - no recreation!
+            if separator:
+                all_chunks.append(TextChunk(text=separator, element_id=separator_element_id))
             all_chunks.extend(ir.chunks)
+            ir = next(ir_iter, None)
 
         return cls(chunks=all_chunks, source_prompt=None)
 
@@ -384,7 +393,7 @@ class IntermediateRepresentation:
         str
             Concatenated text from all chunks.
         """
-        return "".join(chunk.text for chunk in self._chunks)
+        return "".join([chunk.text for chunk in self._chunks])
 
     def compile(self) -> "CompiledIR":
         """
@@ -481,6 +490,8 @@ class CompiledIR:
         The original IntermediateRepresentation.
     """
 
+    __slots__ = ("_ir", "_chunks", "_subtree_chunks", "_elements")
+
     def __init__(self, ir: IntermediateRepresentation):
         """
         Compile an IR by building subtree indexes.
@@ -1,6 +1,9 @@
 """Parsing utilities for format specs and render hints."""
 
+import functools
 
+
+@functools.lru_cache(maxsize=4096)
 def parse_format_spec(format_spec: str, expression: str) -> tuple[str, str]:
     """
     Parse format spec mini-language: "key : render_hints".
@@ -24,19 +27,19 @@ def parse_format_spec(format_spec: str, expression: str) -> tuple[str, str]:
     -------
     tuple[str, str]
         (key, render_hints) where render_hints may be empty string
+
+    Notes
+    -----
+    Results are memoized, since the same template is typically instantiated many times.
     """
     if not format_spec or format_spec == "_":
         # Use expression as key, no render hints
         return expression, ""
 
-    # Split on first colon to separate key from render hints
-    if ":" in format_spec:
-        key_part, hints_part = format_spec.split(":", 1)
-        # Trim key when there's a colon delimiter
-        return key_part.strip(), hints_part
-    else:
-        # No colon, entire format_spec is the key (trim leading/trailing, preserve internal whitespace)
-        return format_spec.strip(), ""
+    # Split on first colon to separate key from render hints (single scan via partition)
+    key_part, _, hints_part = format_spec.partition(":")
+    # Trim the key (leading/trailing only, preserving internal whitespace)
+    return key_part.strip(), hints_part
 
 
 def parse_separator(render_hints: str) -> str:
@@ -58,10 +61,13 @@ def parse_separator(render_hints: str) -> str:
     if not render_hints:
         return "\n"
 
-    # Look for "sep=<value>" in render hints
-    for hint in render_hints.split(":"):
-        if hint.startswith("sep="):
-            return hint[4:]  # Extract everything after "sep="
+    # Look for a "sep=<value>" hint (at the start or right after a colon) without splitting into a list
+    start = 0
+    while (idx := render_hints.find("sep=", start)) != -1:
+        if idx == 0 or render_hints[idx - 1] == ":":
+            end = render_hints.find(":", idx + 4)
+            return render_hints[idx + 4 :] if end == -1 else render_hints[idx + 4 : end]
+        start = idx + 1
 
     return "\n"
 
@@ -115,3 +121,14 @@ def parse_render_hints(render_hints: str, key: str) -> dict[str, str]:
             result["sep"] = hint[4:]
 
     return result
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_render_hints(render_hints: str, key: str) -> dict[str, str]:
+    """
+    Memoized parse_render_hints for the render path.
+
+    A template's render hints are fixed, yet they are re-parsed for every element on
+    every render. Callers must treat the returned dict as read-only since it is shared.
+    """
+    return parse_render_hints(render_hints, key)
@@ -1,6 +1,7 @@
 """StructuredPrompt class and top-level functions."""
 
-import uuid
+import functools
+import sys
 from collections.abc import Iterable, Mapping
 from string.templatelib import Template
 from typing import TYPE_CHECKING, Any, Optional, Union
@@ -14,15 +15,20 @@ from .element import (
     PILImage,
     Static,
     TextInterpolation,
+    _serialize_image,
+    apply_render_hints,
+    apply_render_hints_text,
 )
 from .exceptions import DuplicateKeyError, EmptyExpressionError, MissingKeyError, UnsupportedValueTypeError
+from .ids import _new_id
+from .ir import _DEFAULT_RENDER_CONTEXT, IntermediateRepresentation, RenderContext
+from .parsing import _cached_render_hints
 from .parsing import parse_format_spec as _parse_format_spec
 from .parsing import parse_separator as _parse_separator
-from .source_location import SourceLocation, _capture_source_location
+from .source_location import SourceLocation, _capture_source_location, _serialize_source_location
 from .text import process_dedent as _process_dedent
 
 if TYPE_CHECKING:
-    from .ir import IntermediateRepresentation, RenderContext
     from .widgets.config import WidgetConfig
     from .widgets.widget import Widget
 
@@ -88,7 +94,7 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
         # source_location will be updated to interpolation site when nested
         # For root prompts, source_location == creation_location initially
         self.source_location = _source_location
-        self.id = str(uuid.uuid4())
+        self.id = _new_id()
         self.metadata = {}
         self.expression = None  # Will be set when interpolated
         self.conversion = None
@@ -99,14 +105,14 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
         self._template = template
         self._processed_strings = _processed_strings  # Dedented/trimmed strings if provided
         # All children (Static, StructuredInterpolation, ListInterpolation, ImageInterpolation)
-        self._children: list[Element] = []
+        self._children: tuple[Element, ...] = ()
         # Only interpolations
-        self._interps: list[InterpolationType] = []
+        self._interps: tuple[InterpolationType, ...] = ()
         self._allow_duplicates = allow_duplicate_keys
 
         # Index maps keys to interpolation indices (within _interps list)
-        # If allow_duplicates, maps to list of indices; otherwise, maps to single index
-        self._index: dict[str, Union[int, list[int]]] = {}
+        # Always a list, so lookups need no type check; it has one entry unless allow_duplicates
+        self._index: dict[str, list[int]] = {}
 
         self._build_nodes()
 
@@ -116,6 +122,8 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
         strings = self._processed_strings if self._processed_strings is not None else self._template.strings
         interpolations = self._template.interpolations
 
+        children: list[Element] = []
+        interps: list[InterpolationType] = []
         element_idx = 0  # Overall position in element sequence
         interp_idx = 0  # Position within interpolations list
 
@@ -123,14 +131,15 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
         for static_key, static_text in enumerate(strings):
             # Add static element
             # Use creation_location for child elements - they're created where parent was defined
+            # Interned so identical fragments across prompts share one string
             static = Static(
                 key=static_key,
-                value=static_text,
+                value=sys.intern(static_text),
                 parent=self,
                 index=element_idx,
                 source_location=self._creation_location,
             )
-            self._children.append(static)
+            children.append(static)
             element_idx += 1
 
             # Add interpolation if there's one after this static
@@ -143,13 +152,18 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
                 # Guard against empty keys
                 if not key:
                     raise EmptyExpressionError()
+                # Keys sliced out of format specs are fresh strings; interning them lets
+                # lookups with literal keys (p["inst"]) hit the identity fast path in dicts
+                key = sys.intern(key)
 
                 # Validate and extract value - create appropriate node type
                 val = itp.value
                 if isinstance(val, list):
-                    # Check that all items in the list are StructuredPrompts
-                    if not all(isinstance(item, StructuredPrompt) for item in val):
-                        raise UnsupportedValueTypeError(key, type(val), itp.expression)
+                    # Check that all items in the list are StructuredPrompts (plain loop: no generator frame,
+                    # stops at the first bad item)
+                    for item in val:
+                        if not isinstance(item, StructuredPrompt):
+                            raise UnsupportedValueTypeError(key, type(val), itp.expression)
 
                     # Create ListInterpolation node
                     separator = _parse_separator(render_hints)
@@ -225,22 +239,21 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
                 else:
                     raise UnsupportedValueTypeError(key, type(val), itp.expression)
 
-                self._interps.append(node)
-                self._children.append(node)
+                interps.append(node)
+                children.append(node)
                 element_idx += 1
 
                 # Update index (maps string keys to positions in _interps list)
-                if self._allow_duplicates:
-                    if key not in self._index:
-                        self._index[key] = []
-                    self._index[key].append(interp_idx)  # type: ignore
-                else:
-                    if key in self._index:
-                        raise DuplicateKeyError(key)
-                    self._index[key] = interp_idx
+                if not self._allow_duplicates and key in self._index:
+                    raise DuplicateKeyError(key)
+                self._index.setdefault(key, []).append(interp_idx)
 
                 interp_idx += 1
 
+        # Stored as tuples: fixed after construction, so properties can return them without copying
+        self._children = tuple(children)
+        self._interps = tuple(interps)
+
     # Mapping protocol implementation
 
     def __getitem__(self, key: str) -> InterpolationType:
@@ -264,28 +277,22 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
         ValueError
             If allow_duplicate_keys=True and the key is ambiguous (use get_all instead).
         """
-        if key not in self._index:
-            raise MissingKeyError(key, list(self._index.keys()))
+        indices = self._index.get(key)
+        if indices is None:
+            raise MissingKeyError(key, self._index.keys())
+        if len(indices) > 1:
+            raise ValueError(f"Ambiguous key '{key}' with {len(indices)} occurrences. Use get_all('{key}') instead.")
 
-        idx = self._index[key]
-        if isinstance(idx, list):
-            if len(idx) > 1:
-                raise ValueError(f"Ambiguous key '{key}' with {len(idx)} occurrences. Use get_all('{key}') instead.")
-            idx = idx[0]
-
-        return self._interps[idx]
+        return self._interps[indices[0]]
 
     def __iter__(self) -> Iterable[str]:
         """Iterate over keys in insertion order."""
-        seen = set()
-        for node in self._interps:
-            if node.key not in seen:
-                yield node.key
-                seen.add(node.key)
+        # _index holds each unique key once, in first-occurrence order
+        return iter(self._index)
 
     def __len__(self) -> int:
         """Return the number of unique keys."""
-        return len(set(node.key for node in self._interps))
+        return len(self._index)
 
     def get_all(self, key: str) -> list[InterpolationType]:
         """
@@ -306,14 +313,11 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
         MissingKeyError
             If the key is not found.
         """
-        if key not in self._index:
-            raise MissingKeyError(key, list(self._index.keys()))
+        indices = self._index.get(key)
+        if indices is None:
+            raise MissingKeyError(key, self._index.keys())
 
-        idx = self._index[key]
-        if isinstance(idx, list):
-            return [self._interps[i] for i in idx]
-        else:
-            return [self._interps[idx]]
+        return [self._interps[i] for i in indices]
 
     # Properties for provenance
     # (id is inherited from Element)
@@ -331,12 +335,12 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
     @property
     def interpolations(self) -> tuple[InterpolationType, ...]:
         """Return all interpolation nodes in order."""
-        return tuple(self._interps)
+        return self._interps
 
     @property
     def children(self) -> tuple[Element, ...]:
         """Return all children (Static and StructuredInterpolation) in order."""
-        return tuple(self._children)
+        return self._children
 
     @property
     def creation_location(self) -> Optional[SourceLocation]:
@@ -395,9 +399,6 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
         IntermediateRepresentation
             Object containing chunks with source mapping via element_id.
         """
-        from .element import apply_render_hints
-        from .ir import IntermediateRepresentation, RenderContext
-        from .parsing import parse_render_hints
 
         # Create render context if not provided
         if ctx is None:
@@ -405,7 +406,7 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
 
         # If this prompt has been nested (has render_hints), parse them and update context
         if self.render_hints:
-            hints = parse_render_hints(self.render_hints, str(self.key))
+            hints = _cached_render_hints(self.render_hints, str(self.key))
             # Update header level if header hint is present
             next_level = ctx.header_level + 1 if "header" in hints else ctx.header_level
             # Update context for nested rendering
@@ -416,14 +417,14 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
             )
 
         # Convert each element to IR
-        element_irs = [element.ir(ctx) for element in self._children]
+        element_irs = (element.ir(ctx) for element in self._children)
 
         # Merge all element IRs (no separator - children are already interleaved with statics)
         merged_ir = IntermediateRepresentation.merge(element_irs, separator="")
 
         # Apply render hints if this prompt has been nested
         if self.render_hints:
-            hints = parse_render_hints(self.render_hints, str(self.key))
+            hints = _cached_render_hints(self.render_hints, str(self.key))
             # Use parent's header level for hint application (before increment)
             parent_header_level = ctx.header_level - 1 if "header" in hints else ctx.header_level
             merged_ir = apply_render_hints(merged_ir, hints, parent_header_level, ctx.max_header_level, self.id)
@@ -436,9 +437,61 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
             source_prompt=source_prompt,
         )
 
+    def _render_text(self, ctx: Optional["RenderContext"] = None) -> str:
+        """
+        Render this prompt straight to text without building IR chunks.
+
+        Mirrors ir() (context updates and render hints) but concatenates strings
+        instead of allocating chunks. See Element._render_text.
+
+        Parameters
+        ----------
+        ctx : RenderContext | None, optional
+            Rendering context. If None, uses the same defaults as ir().
+
+        Returns
+        -------
+        str
+            The rendered text, equal to ``self.ir(ctx).text``.
+        """
+
+        if ctx is None:
+            ctx = _DEFAULT_RENDER_CONTEXT
+
+        if not self.render_hints:
+            return self._render_children_text(ctx)
+
+        hints = _cached_render_hints(self.render_hints, str(self.key))
+        child_ctx = RenderContext(
+            path=ctx.path + (self.key,) if self.key is not None else ctx.path,
+            header_level=ctx.header_level + 1 if "header" in hints else ctx.header_level,
+            max_header_level=ctx.max_header_level,
+        )
+        text = self._render_children_text(child_ctx)
+        return apply_render_hints_text(text, hints, ctx.header_level, ctx.max_header_level)
+
+    def _render_children_text(self, ctx: "RenderContext") -> str:
+        """Join children's text, walking statics and interpolations in lockstep."""
+        # Children strictly interleave Static, interpolation, Static, ..., so statics sit at even
+        # positions and their text is used as-is; only interpolations need dispatch
+        children = self._children
+        if not self._interps:
+            # Constant prompt: its text is the single static
+            return children[0].value
+        parts = [children[0].value]
+        for i, interp in enumerate(self._interps, 1):
+            parts.append(interp._render_text(ctx))
+            parts.append(children[2 * i].value)
+        return "".join(parts)
+
     def __str__(self) -> str:
-        """Render to string (convenience for ir().text)."""
-        return self.ir().text
+        """
+        Render to string without building chunks.
+
+        Goes through ``_render_text`` rather than ``ir()``; the two must agree, so a
+        subclass overriding one of them has to override the other as well.
+        """
+        return self._render_text()
 
     def toJSON(self) -> dict[str, Any]:
         """
@@ -476,9 +529,6 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
 
         def _build_element_tree(element: Element, parent_id: str) -> dict[str, Any]:
             """Build JSON representation of a single element with its children."""
-            from .element import _serialize_image
-            from .source_location import _serialize_source_location
-
             base = {
                 "type": "",  # Will be set below
                 "id": element.id,
@@ -488,37 +538,38 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
                 "source_location": _serialize_source_location(element.source_location),
             }
 
+            # Most common element types are checked first
             if isinstance(element, Static):
                 base["type"] = "static"
                 base["value"] = element.value
 
-            elif isinstance(element, StructuredPrompt):
-                # StructuredPrompt is now stored directly as a child element
-                base["type"] = "nested_prompt"
+            elif isinstance(element, TextInterpolation):
+                base["type"] = "interpolation"
                 base.update(
                     {
                         "expression": element.expression,
                         "conversion": element.conversion,
                         "format_spec": element.format_spec,
                         "render_hints": element.render_hints,
-                        "prompt_id": element.id,  # Element itself is the prompt
-                        "creation_location": _serialize_source_location(element.creation_location),
+                        "value": element.value,
                     }
                 )
-                # Nested prompt - recurse into its children
-                base["children"] = _build_children_tree(element, element.id)
 
-            elif isinstance(element, TextInterpolation):
-                base["type"] = "interpolation"
+            elif isinstance(element, StructuredPrompt):
+                # StructuredPrompt is now stored directly as a child element
+                base["type"] = "nested_prompt"
                 base.update(
                     {
                         "expression": element.expression,
                         "conversion": element.conversion,
                         "format_spec": element.format_spec,
                         "render_hints": element.render_hints,
-                        "value": element.value,
+                        "prompt_id": element.id,  # Element itself is the prompt
+                        "creation_location": _serialize_source_location(element.creation_location),
                     }
                 )
+                # Nested prompt - recurse into its children
+                base["children"] = _build_children_tree(element, element.id)
 
             elif isinstance(element, ListInterpolation):
                 base["type"] = "list"
@@ -703,6 +754,26 @@ class StructuredPrompt(Element, Mapping[str, InterpolationType]):
         return self.widget()._repr_html_()
 
 
+@functools.lru_cache(maxsize=1024)
+def _process_template_strings(
+    strings: tuple[str, ...], *, dedent: bool, trim_leading: bool, trim_empty_leading: bool, trim_trailing: bool
+) -> tuple[str, ...]:
+    """
+    Memoized process_dedent keyed on a template's static strings and options.
+
+    A t-string literal evaluated repeatedly (e.g. inside a prompt-building function)
+    yields the same static strings every time, so the dedent/trim pass only needs to
+    run once per distinct template. The result is an immutable tuple and safe to share.
+    """
+    return _process_dedent(
+        strings,
+        dedent=dedent,
+        trim_leading=trim_leading,
+        trim_empty_leading=trim_empty_leading,
+        trim_trailing=trim_trailing,
+    )
+
+
 def prompt(
     template: Template,
     /,
@@ -791,7 +862,7 @@ def prompt(
 
     # Apply dedenting/trimming if any are enabled
     if dedent or trim_leading or trim_empty_leading or trim_trailing:
-        processed_strings = _process_dedent(
+        processed_strings = _process_template_strings(
             template.strings,
             dedent=dedent,
             trim_leading=trim_leading,
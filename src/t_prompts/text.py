@@ -76,15 +76,16 @@ def process_dedent(
     # Step 3: Trim trailing lines
     if trim_trailing and result[-1]:
         last = result[-1]
-        # Remove all trailing whitespace (including newlines and spaces)
-        # Split into lines and work backwards
-        if last:
-            lines = last.split("\n")
-            # Remove trailing empty/whitespace-only lines
-            while lines and lines[-1].strip() == "":
-                lines.pop()
-            # Rejoin
-            result[-1] = "\n".join(lines)
+        # Remove trailing whitespace-only lines. rstrip() finds the last non-whitespace
+        # character in a single C-level scan; everything after the newline that ends
+        # its line is dropped (the content line itself keeps its trailing spaces).
+        content_end = len(last.rstrip())
+        if not content_end:
+            result[-1] = ""
+        else:
+            line_end = last.find("\n", content_end)
+            if line_end != -1:
+                result[-1] = last[:line_end]
 
     # Step 4: Dedent
     if dedent:
@@ -114,37 +115,16 @@ def process_dedent(
             if indent_level is not None:
                 break
 
-        # Apply dedenting if we found an indent level
+        # Apply dedenting if we found an indent level.
+        # Lines carrying the full indent lose exactly indent_level spaces; lines with less
+        # indentation (including whitespace-only lines) lose whatever leading whitespace they have.
         if indent_level is not None and indent_level > 0:
+            prefix = " " * indent_level
             for i, s in enumerate(result):
                 if not s:
                     continue
-                lines = s.split("\n")
-                dedented_lines = []
-                for line in lines:
-                    if line.strip():  # Non-empty line
-                        # Remove indent_level spaces
-                        if line.startswith(" " * indent_level):
-                            dedented_lines.append(line[indent_level:])
-                        else:
-                            # Line has less indentation than expected
-                            # Remove what we can
-                            leading = line[: len(line) - len(line.lstrip())]
-                            if len(leading) > 0:
-                                dedented_lines.append(line[len(leading) :])
-                            else:
-                                dedented_lines.append(line)
-                    else:
-                        # Empty line (just whitespace) - dedent it too
-                        if line.startswith(" " * indent_level):
-                            dedented_lines.append(line[indent_level:])
-                        else:
-                            # Line has less indentation than expected, remove what we can
-                            leading = line[: len(line) - len(line.lstrip())]
-                            if len(leading) > 0:
-                                dedented_lines.append(line[len(leading) :])
-                            else:
-                                dedented_lines.append(line)
-                result[i] = "\n".join(dedented_lines)
+                result[i] = "\n".join(
+                    line[indent_level:] if line.startswith(prefix) else line.lstrip() for line in s.split("\n")
+                )
 
     return tuple(result)
@@ -349,3 +349,17 @@ def test_compiled_ir_with_list_separator():
     separator_chunks = [chunk for chunk in list_chunks if chunk.text == ", "]
     assert len(separator_chunks) == 1
     assert separator_chunks[0].element_id == p["items"].id
+
+
+def test_merge_accepts_a_generator():
+    """Test that IntermediateRepresentation.merge consumes any iterable of IRs."""
+    from t_prompts.ir import IntermediateRepresentation
+
+    irs = [IntermediateRepresentation.from_text(word, element_id="e") for word in ("a", "b", "c")]
+
+    merged = IntermediateRepresentation.merge((ir for ir in irs), separator=", ", separator_element_id="sep")
+    assert merged.text == "a, b, c"
+    assert [chunk.element_id for chunk in merged.chunks] == ["e", "sep", "e", "sep", "e"]
+
+    assert IntermediateRepresentation.merge(iter(irs[:1])) is irs[0]
+    assert IntermediateRepresentation.merge(iter([])).text == ""
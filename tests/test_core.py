@@ -197,3 +197,26 @@ def test_template_property():
     from string.templatelib import Template
 
     assert isinstance(p.template, Template)
+
+
+def test_all_public_names_resolve():
+    """Test that every name in __all__ is reachable, including lazily exported ones."""
+    for name in t_prompts.__all__:
+        assert getattr(t_prompts, name) is not None
+        assert name in dir(t_prompts)
+
+    assert set(t_prompts._LAZY) <= set(t_prompts.__all__)
+    # Exceptions are listed explicitly in the package __all__ for type checkers; keep them in sync
+    assert set(t_prompts.exceptions.__all__) <= set(t_prompts.__all__)
+
+
+def test_lazy_submodules_resolve_as_attributes(monkeypatch):
+    """Test that t_prompts.diff and t_prompts.widgets resolve without an explicit submodule import."""
+    import importlib
+
+    for name in ("diff", "widgets"):
+        module = importlib.import_module(f"t_prompts.{name}")
+        # Simulate a fresh package namespace where the submodule is not bound yet
+        monkeypatch.delattr(t_prompts, name)
+        assert getattr(t_prompts, name) is module
+        assert name in dir(t_prompts)
@@ -633,3 +633,20 @@ def test_dedent_only_no_trims():
     # First line not removed, so dedenting considers it
     result = str(p)
     assert result.startswith("\n")
+
+
+def test_repeated_template_reuses_processed_strings():
+    """Test that evaluating the same t-string literal twice reuses the dedented statics."""
+
+    def build(task):
+        return t_prompts.dedent(t"""
+            Task: {task:t}
+            Please respond.
+            """)
+
+    first = build("translate")
+    second = build("summarize")
+
+    assert str(first) == "Task: translate\nPlease respond."
+    assert str(second) == "Task: summarize\nPlease respond."
+    assert first._processed_strings is second._processed_strings
@@ -92,6 +92,61 @@ def test_rendered_diff_tracks_chunk_operations():
     assert '"diff_type": "rendered"' in html
 
 
+def test_text_edits_are_minimal_for_scattered_changes():
+    """Leaf text diffs report only the changed characters, even with several separate edits."""
+
+    task = "translate"
+    before = prompt(t"alpha beta gamma delta {task:t}")
+    after = prompt(t"alpha bXta gamma dXlta {task:t}")
+
+    diff = diff_structured_prompts(before, after)
+
+    static = next(child for child in diff.root.children if child.status == "modified")
+    changed = [edit for edit in static.text_edits if edit.op != "equal"]
+    assert [(edit.op, edit.before, edit.after) for edit in changed] == [("replace", "e", "X"), ("replace", "e", "X")]
+    assert "".join(edit.before for edit in static.text_edits) == "alpha beta gamma delta "
+    assert "".join(edit.after for edit in static.text_edits) == "alpha bXta gamma dXlta "
+
+
+def test_fully_rewritten_text_falls_back_to_sequence_matcher():
+    """Unrelated texts skip the minimal diff but still produce edits that rebuild both sides."""
+    import random
+
+    from t_prompts.diff import _myers_opcodes
+
+    rng = random.Random(0)
+    old_text = "".join(rng.choice("abcdefgh ") for _ in range(2000))
+    new_text = "".join(rng.choice("ijklmnop ") for _ in range(2000))
+    assert _myers_opcodes(old_text, new_text) is None
+    # Same characters in a different order: the count bound cannot reject it, the round cap does
+    shuffled = "".join(rng.sample(old_text, len(old_text)))
+    assert _myers_opcodes(old_text, shuffled) is None
+
+    before = prompt(t"{old_text:body}")
+    after = prompt(t"{new_text:body}")
+    node = diff_structured_prompts(before, after).root.children[1]
+
+    assert node.status == "modified"
+    assert "".join(edit.before for edit in node.text_edits) == old_text
+    assert "".join(edit.after for edit in node.text_edits) == new_text
+
+
+def test_rendered_diff_isolates_single_edit_in_long_prompt():
+    """A single edit in a long list yields one replace with every other chunk equal."""
+
+    before_items = [prompt(t"- item {str(i):v}") for i in range(50)]
+    before = prompt(t"Items:\n{before_items:list}\n")
+    after_items = [prompt(t"- item {str(i) if i != 25 else 'changed':v}") for i in range(50)]
+    after = prompt(t"Items:\n{after_items:list}\n")
+
+    stats = diff_rendered_prompts(before, after).stats()
+
+    assert stats["replace"] == 1
+    assert stats["insert"] == 0
+    assert stats["delete"] == 0
+    assert stats["equal"] > 100
+
+
 def test_diff_objects_are_json_serializable_roundtrip():
     """Stats payloads can be serialized for downstream analytics."""
 
@@ -215,3 +270,38 @@ def test_structured_diff_widget_data_serializes_text_edits_and_attr_changes():
     for node in widget_data["root"]["children"]:
         for change in node["attr_changes"].values():
             assert isinstance(change, list)
+
+
+def test_node_summary_agrees_with_diff_stats():
+    """NodeDelta.summarize counts the same nodes as the aggregated diff stats."""
+
+    a = "A"
+    b = "B"
+    before = prompt(t"{a:a}")
+    after = prompt(t"{a:a} and {b:b}")
+
+    diff = diff_structured_prompts(before, after)
+    summary = diff.root.summarize()
+
+    assert summary["added"] == diff.stats.nodes_added >= 1
+    assert summary["removed"] == diff.stats.nodes_removed
+    assert summary["modified"] == diff.stats.nodes_modified
+    assert summary["moved"] == diff.stats.nodes_moved
+
+
+def test_diffing_a_prompt_against_itself_is_all_equal():
+    """A prompt diffed against itself yields an all-equal delta tree mirroring its structure."""
+
+    items = [prompt(t"- one"), prompt(t"- two")]
+    name = "Ada"
+    p = prompt(t"Hi {name:n}\n{items:items}")
+
+    diff = diff_structured_prompts(p, p)
+
+    assert diff.root.status == "equal"
+    assert diff.stats.nodes_modified == diff.stats.nodes_added == diff.stats.nodes_removed == 0
+    assert diff.metrics.struct_edit_count == 0
+    assert len(diff.root.children) == len(p.children)
+    list_delta = next(child for child in diff.root.children if child.element_type == "ListInterpolation")
+    assert len(list_delta.children) == 2
+    assert all(child.status == "equal" for child in list_delta.children)
@@ -41,6 +41,18 @@ def test_duplicate_keys_allowed():
     assert nodes[1].value == "B"
 
 
+def test_duplicate_keys_counted_once_in_len_and_iter():
+    """Test that len() and iteration see each duplicate key once, in first-occurrence order."""
+    a = "A"
+    b = "B"
+    c = "C"
+
+    p = t_prompts.prompt(t"{a:x} {b:y} {c:x}", allow_duplicate_keys=True)
+
+    assert len(p) == 2
+    assert list(p) == ["x", "y"]
+
+
 def test_expression_with_whitespace():
     """Test that expressions with whitespace in keys via format spec."""
     value = "test"
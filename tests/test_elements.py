@@ -201,3 +201,61 @@ def test_adjacent_interpolations_with_empty_static():
     # Check that middle static is empty
     assert elements[2].value == ""
     assert isinstance(elements[2], t_prompts.Static)
+
+
+def test_elements_and_ir_have_no_instance_dict():
+    """Test that element, chunk, and IR instances use slots instead of a per-instance __dict__."""
+    value = "A"
+    inner = t_prompts.prompt(t"inner")
+    items = [t_prompts.prompt(t"item")]
+    p = t_prompts.prompt(t"{value:v} {inner:i} {items:l}")
+
+    for elem in p.children:
+        assert not hasattr(elem, "__dict__"), type(elem).__name__
+
+    ir = p.ir()
+    assert not hasattr(ir, "__dict__")
+    assert not hasattr(ir.compile(), "__dict__")
+    for chunk in ir.chunks:
+        assert not hasattr(chunk, "__dict__")
+    assert not hasattr(p.source_location, "__dict__")
+
+
+def test_identical_static_text_is_shared_across_prompts():
+    """Test that equal static fragments built at runtime in different prompts hold the same string object."""
+    a = "x"
+    # Different indentation means dedent produces each fragment as a fresh runtime string
+    p1 = t_prompts.dedent(t"""
+        <|user|>
+        {a:a}""")
+    p2 = t_prompts.dedent(t"""
+            <|user|>
+            {a:b}""")
+
+    assert p1.children[0].value == "<|user|>\n"
+    assert p1.children[0].value is p2.children[0].value
+
+
+def test_children_and_interpolations_are_not_copied_per_access():
+    """Test that the children and interpolations properties return the same tuple each time."""
+    value = "A"
+    p = t_prompts.prompt(t"{value:v} tail")
+
+    assert isinstance(p.children, tuple)
+    assert p.children is p.children
+    assert p.interpolations is p.interpolations
+
+
+def test_element_ids_are_unique_uuid_strings():
+    """Test that generated ids stay unique and keep the canonical UUID form."""
+    import uuid
+
+    value = "A"
+    prompts = [t_prompts.prompt(t"{value:v} tail") for _ in range(50)]
+    ids = [p.id for p in prompts]
+    ids += [elem.id for p in prompts for elem in p.children]
+    ids += [chunk.id for p in prompts for chunk in p.ir().chunks]
+
+    assert len(set(ids)) == len(ids)
+    for element_id in ids:
+        assert str(uuid.UUID(element_id)) == element_id
@@ -200,3 +200,19 @@ def test_missing_key_error_lists_available_keys():
     assert "'a'" in err_msg
     assert "'b'" in err_msg
     assert "'c'" in err_msg
+
+
+def test_missing_key_error_attributes():
+    """Test that MissingKeyError keeps a key snapshot and reports its message through args."""
+    a = "A"
+    b = "B"
+    p = t_prompts.prompt(t"{a:a} {b:b}")
+
+    with pytest.raises(MissingKeyError) as exc_info:
+        _ = p["d"]
+
+    err = exc_info.value
+    assert err.key == "d"
+    assert err.available_keys == ("a", "b")
+    assert err.args == (str(err),)
+    assert "Available keys: 'a', 'b'" in repr(err)
@@ -260,3 +260,28 @@ def test_image_with_dedent():
     assert "[Image:" in result
     assert "64x64" in result
     assert "A pattern" in result  # Text interpolation also works
+
+
+def test_image_serialization_follows_in_place_edits():
+    """Test that repeated toJSON is stable and reflects pixel and palette edits made in place."""
+    import base64
+    import io
+
+    def payload_image(p):
+        image_data = next(child for child in p.toJSON()["children"] if child["type"] == "image")["image_data"]
+        return Image.open(io.BytesIO(base64.b64decode(image_data["base64_data"])))
+
+    img = create_checkerboard(size=16, square_size=4)
+    p = prompt(t"Image: {img:img}")
+
+    assert p.toJSON() == p.toJSON()
+    img.putpixel((0, 0), (255, 0, 0))
+    assert payload_image(p).getpixel((0, 0)) == (255, 0, 0)
+
+    palette_img = Image.new("P", (4, 4), color=0)
+    palette_img.putpalette([10, 20, 30] * 256)
+    q = prompt(t"Image: {palette_img:img}")
+
+    assert payload_image(q).convert("RGB").getpixel((0, 0)) == (10, 20, 30)
+    palette_img.putpalette([200, 100, 50] * 256)
+    assert payload_image(q).convert("RGB").getpixel((0, 0)) == (200, 100, 50)
@@ -152,3 +152,33 @@ def test_render_consistency():
     result3 = str(p)
 
     assert result1 == result2 == result3
+
+
+def test_str_matches_ir_text_with_hints_and_nesting():
+    """Test that the direct text render path agrees with the IR text for complex prompts."""
+    body = "Be concise."
+    empty = ""
+    quoted = "it's"
+    level3 = t_prompts.prompt(t"{body:b:header=Deep}")
+    level2 = t_prompts.prompt(t"Intro\n{level3:l3:header}")
+    items = [t_prompts.prompt(t"- {body:b}"), t_prompts.prompt(t"- {quoted!r:q:xml=q}")]
+    empty_items = []
+    p = t_prompts.prompt(
+        t"{level2:l2:header=Top:xml=outer}\n{items:list:sep=; :header=Items}\n{empty:e:xml=none}{empty_items:el:xml=x}"
+    )
+
+    assert str(p) == p.ir().text
+    assert str(level2) == level2.ir().text
+    assert str(items[1]) == items[1].ir().text
+    assert "### Deep" in str(p)
+
+
+def test_constant_prompt_renders_its_static_text():
+    """Test that a prompt without interpolations renders to its static text, with and without hints."""
+    const = t_prompts.prompt(t"You are a helpful assistant.")
+    assert str(const) == "You are a helpful assistant."
+    assert str(const) == const.ir().text
+
+    p = t_prompts.prompt(t"{const:system:xml=system}")
+    assert str(p) == "<system>You are a helpful assistant.</system>"
+    assert str(p) == p.ir().text
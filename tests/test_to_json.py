@@ -299,6 +299,13 @@ def test_to_json_with_image():
     assert image_data["height"] == 10
     assert image_data["mode"] == "RGB"
 
+    # The base64 payload decodes back to the same pixels
+    import base64
+    import io
+
+    decoded = Image.open(io.BytesIO(base64.b64decode(image_data["base64_data"])))
+    assert decoded.tobytes() == img.tobytes()
+
 
 def test_to_json_element_indices():
     """Test that element indices are preserved in toJSON()."""